@@ -4,46 +4,150 @@ Data Ingestion Script for Pump.fun Trading Data
 Reads CSV file and publishes each trade to Redpanda
 """
 
+import argparse
 import csv
-import json
+import logging
+import mmap
+import multiprocessing
+import os
+import queue
+import threading
 import time
-from kafka import KafkaProducer
+from dataclasses import make_dataclass
+from functools import partial
+from itertools import islice
+from logging.handlers import QueueHandler, QueueListener
+import orjson
+from confluent_kafka import Producer
 from datetime import datetime
 import sys
 
+logger = logging.getLogger(__name__)
+
 # Configuration
 REDPANDA_BROKER = 'localhost:19092'  # External port for host access
 TOPIC_NAME = 'trade-data'
 CSV_FILE = 'trades_data.csv'
+BATCH_SIZE = 500  # Suggested trades per message when batching is enabled
+MAX_MESSAGE_BYTES = 900000  # Split batches above this; librdkafka rejects values over 1MB (message.max.bytes)
+READ_BATCH_ROWS = 1024  # CSV rows decoded per block
+READ_BUFFER_BYTES = 1 << 20  # 1MB file buffer: fewer read() calls on large CSVs
+PARSE_QUEUE_BLOCKS = 10  # Decoded blocks buffered ahead of the publisher
+PROGRESS_MASK = 1023  # Log progress every 1024 messages
+
+# Marks the end of the decoded blocks handed over by the parse thread
+END_OF_FILE = object()
+
+# Encoded partition keys per token; a handful of tokens repeat across
+# thousands of rows, so each is encoded once and the bytes are reused
+KEY_CACHE = {}
+KEY_CACHE_MAX_SIZE = 100000  # Reset the cache beyond this many distinct tokens
+
+# Producer batching, tuned for bulk CSV loads (override via environment)
+PRODUCER_LINGER_MS = int(os.environ.get('PRODUCER_LINGER_MS', '200'))
+PRODUCER_BATCH_BYTES = int(os.environ.get('PRODUCER_BATCH_BYTES', '524288'))  # 512KB
+PRODUCER_BUFFER_KBYTES = int(os.environ.get('PRODUCER_BUFFER_KBYTES', '65536'))  # 64MB
+PRODUCE_BLOCK_SECONDS = 60  # Longest wait for room in a full local queue, as kafka-python's max_block_ms
+
+# lz4 is far cheaper on the producer than gzip; zstd trades some speed for
+# a better ratio on the repetitive JSON keys (tune with PRODUCER_COMPRESSION_LEVEL)
+PRODUCER_COMPRESSION = os.environ.get('PRODUCER_COMPRESSION', 'lz4')
+PRODUCER_COMPRESSION_LEVEL = int(os.environ.get('PRODUCER_COMPRESSION_LEVEL', '-1'))  # -1: codec default
+
+# Column types for trades_data.csv (block_num and is_buy are handled separately)
+STRING_FIELDS = (
+    'block_time', 'transaction_signature', 'program_id', 'trade_type',
+    'wallet_address', 'token_address', 'fee_recipient', 'creator_address',
+    'ingested_at',
+)
+FLOAT_FIELDS = (
+    # Critical fields for RSI calculation
+    'amount_in_sol', 'amount_in_token', 'price_in_sol',
+    # Price change data
+    'change_in_sol', 'change_in_tokens',
+    # Reserve data for context
+    'virtual_sol_reserves', 'virtual_token_reserves',
+    'real_sol_reserves', 'real_token_reserves',
+    # Fee information
+    'fee_amount', 'creator_fee_amount',
+)
+INT_FIELDS = ('fee_basis_points', 'creator_fee_basis_points')
+
+# Trade message fields, in the order make_row_decoder() produces them
+TRADE_FIELDS = (
+    STRING_FIELDS + ('block_num', 'is_buy') + FLOAT_FIELDS + INT_FIELDS
+    + ('processed_timestamp',)
+)
+
+# Slotted record for one trade: much smaller than a per-row dict, and orjson
+# serializes dataclasses natively into the same JSON object
+Trade = make_dataclass('Trade', TRADE_FIELDS, namespace={'__slots__': TRADE_FIELDS})
+
+def setup_logging():
+    """
+    Send log records to stdout from a background thread
+    
+    The ingestion loop only enqueues records, so console writes never stall
+    sending. Stop the returned listener to flush any pending records.
+    
+    Returns:
+        QueueListener: Started listener writing to stdout
+    """
+    log_queue = queue.SimpleQueue()
+    
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    return listener
+
+def producer_config():
+    """
+    Build the librdkafka configuration shared by all producers
+    
+    Returns:
+        dict: Producer configuration
+    """
+    return {
+        # Connect to Redpanda broker
+        'bootstrap.servers': REDPANDA_BROKER,
+        
+        # Wait for acknowledgment from broker (ensures message is written)
+        'acks': 'all',
+        
+        # Retry configuration
+        'retries': 3,
+        
+        # Compression to reduce network bandwidth
+        'compression.type': PRODUCER_COMPRESSION,
+        'compression.level': PRODUCER_COMPRESSION_LEVEL,
+        
+        # Batch settings for performance: fewer, larger requests to the broker
+        'linger.ms': PRODUCER_LINGER_MS,
+        'batch.size': PRODUCER_BATCH_BYTES,
+        
+        # Allow plenty of messages to queue up while librdkafka sends
+        'queue.buffering.max.messages': 1000000,
+        'queue.buffering.max.kbytes': PRODUCER_BUFFER_KBYTES
+    }
 
 def create_producer():
     """
     Create and configure Kafka producer for Redpanda
     
     Returns:
-        KafkaProducer: Configured producer instance
+        Producer: Configured librdkafka-backed producer instance
     """
     try:
-        producer = KafkaProducer(
-            # Connect to Redpanda broker
-            bootstrap_servers=[REDPANDA_BROKER],
-            
-            # Serialize messages as JSON
-            value_serializer=lambda v: json.dumps(v).encode('utf-8'),
-            
-            # Wait for acknowledgment from broker (ensures message is written)
-            acks='all',
-            
-            # Retry configuration
-            retries=3,
-            
-            # Compression to reduce network bandwidth
-            compression_type='gzip',
-            
-            # Batch settings for performance
-            linger_ms=10,  # Wait 10ms to batch messages
-            batch_size=16384  # 16KB batch size
-        )
+        producer = Producer(producer_config())
+        
+        # The producer connects lazily, so fetch metadata to fail fast
+        producer.list_topics(timeout=10)
         
         print(f"✅ Successfully connected to Redpanda at {REDPANDA_BROKER}")
         return producer
@@ -52,161 +156,639 @@ def create_producer():
         print(f"❌ Failed to create producer: {e}")
         sys.exit(1)
 
-def parse_csv_row(row):
+def encode_key(token_address):
     """
-    Convert CSV row to structured JSON message
+    Get the partition key bytes for a token, reusing cached encodings
     
     Args:
-        row (dict): CSV row as dictionary
+        token_address (str): Token address used as the message key
         
     Returns:
-        dict: Structured trade message
+        bytes: UTF-8 encoded key
+    """
+    key = KEY_CACHE.get(token_address)
+    if key is None:
+        if len(KEY_CACHE) >= KEY_CACHE_MAX_SIZE:
+            KEY_CACHE.clear()
+        key = KEY_CACHE[token_address] = token_address.encode('utf-8')
+    return key
+
+def make_row_decoder(header):
+    """
+    Build a decoder that converts CSV rows to structured JSON messages
+    
+    Column positions are resolved once from the header, so each row is read
+    by index instead of being turned into a dictionary first.
+    
+    Args:
+        header (list): Column names from the first line of the CSV
+        
+    Returns:
+        function: decode_row(row) returning a Trade;
+            raises ValueError or IndexError for malformed rows
+        
+    Raises:
+        ValueError: If the header is missing any required column
+    """
+    column = {name: position for position, name in enumerate(header)}
+    
+    # Validate the schema once here rather than failing on every row
+    missing = [name for name in TRADE_FIELDS if name != 'processed_timestamp' and name not in column]
+    if missing:
+        raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+    
+    string_columns = [column[name] for name in STRING_FIELDS]
+    float_columns = [column[name] for name in FLOAT_FIELDS]
+    int_columns = [column[name] for name in INT_FIELDS]
+    block_num_column = column['block_num']
+    is_buy_column = column['is_buy']
+    
+    def decode_row(row):
+        """
+        Convert a CSV row to a structured trade message
+        
+        Args:
+            row (list): CSV row as a list of cell values
+            
+        Returns:
+            Trade: Structured trade message, with processed_timestamp left
+                unset for the publisher to fill in
+        """
+        # Values are collected in TRADE_FIELDS order
+        # Text columns are passed through unchanged
+        values = [row[i] for i in string_columns]
+        
+        block_num = row[block_num_column]
+        values.append(int(block_num) if block_num else None)
+        values.append(row[is_buy_column].lower() == 'true')
+        
+        # Numeric columns: empty cells become 0
+        for i in float_columns:
+            value = row[i]
+            values.append(float(value) if value else 0.0)
+        
+        for i in int_columns:
+            value = row[i]
+            values.append(int(value) if value else 0)
+        
+        # Metadata, stamped when the message is sent
+        values.append(None)
+        
+        return Trade(*values)
+    
+    return decode_row
+
+def read_trade_batches(reader, decode_row, rows_per_batch=READ_BATCH_ROWS, slice_start=None):
+    """
+    Read and decode CSV rows in fixed-size blocks
+    
+    Args:
+        reader: csv.reader positioned after the header
+        decode_row (function): Row decoder from make_row_decoder()
+        rows_per_batch (int): Maximum rows per block
+        slice_start (int): Byte offset of the file slice being read, if any;
+            row numbers in warnings then count from the start of the slice
+        
+    Yields:
+        list: Decoded trade messages, with None for rows that failed to parse
+    """
+    where = '' if slice_start is None else f" of the slice at byte {slice_start}"
+    
+    rows_read = 0
+    while True:
+        rows = list(islice(reader, rows_per_batch))
+        if not rows:
+            return
+        # Blank lines come through as empty rows and are skipped, as
+        # DictReader did; they still count towards row numbers
+        try:
+            trade_messages = [decode_row(row) for row in rows if row]
+        except (ValueError, IndexError):
+            # Rare path: redo this block row by row to skip the bad rows
+            trade_messages = []
+            for row_num, row in enumerate(rows, start=rows_read + 1):
+                if not row:
+                    continue
+                try:
+                    trade_messages.append(decode_row(row))
+                except (ValueError, IndexError) as e:
+                    logger.warning(f"⚠️  Error parsing row {row_num}{where}: {e}")
+                    trade_messages.append(None)
+        
+        rows_read += len(rows)
+        yield trade_messages
+
+def parse_worker(reader, decode_row, block_queue):
+    """
+    Decode CSV blocks on a background thread and hand them to the publisher
+    
+    Runs until the file is exhausted, then puts END_OF_FILE on the queue. If
+    reading fails, the exception is queued first so the publisher can raise it.
+    
+    Args:
+        reader: csv.reader positioned after the header
+        decode_row (function): Row decoder from make_row_decoder()
+        block_queue (queue.Queue): Bounded queue shared with the publisher
     """
     try:
-        # Convert numeric fields to appropriate types
-        trade_message = {
-            'block_time': row['block_time'],
-            'transaction_signature': row['transaction_signature'],
-            'block_num': int(row['block_num']) if row['block_num'] else None,
-            'program_id': row['program_id'],
-            'trade_type': row['trade_type'],
-            'wallet_address': row['wallet_address'],
-            'token_address': row['token_address'],
-            'is_buy': row['is_buy'].lower() == 'true',
+        for trade_messages in read_trade_batches(reader, decode_row):
+            block_queue.put(trade_messages)
+    except Exception as e:
+        block_queue.put(e)
+    finally:
+        block_queue.put(END_OF_FILE)
+
+def iter_queued_blocks(block_queue):
+    """
+    Yield decoded blocks from the parse thread until END_OF_FILE
+    
+    Args:
+        block_queue (queue.Queue): Queue filled by parse_worker()
+        
+    Yields:
+        list: Decoded trade messages, with None for rows that failed to parse
+        
+    Raises:
+        Exception: The error that stopped the parse thread, if any
+    """
+    for trade_messages in iter(block_queue.get, END_OF_FILE):
+        if isinstance(trade_messages, Exception):
+            raise trade_messages
+        yield trade_messages
+
+def publish_trade_blocks(producer, trade_blocks, simulate_realtime=False, batch_size=1):
+    """
+    Publish decoded trade blocks to Redpanda and wait for delivery
+    
+    Args:
+        producer (Producer): Kafka producer instance
+        trade_blocks: Iterable of decoded blocks from read_trade_batches()
+        simulate_realtime (bool): If True, paces messages 100ms apart
+        batch_size (int): Trades per message; above 1, each message value is
+            a JSON array of trades for a single token
             
-            # Critical fields for RSI calculation
-            'amount_in_sol': float(row['amount_in_sol']) if row['amount_in_sol'] else 0.0,
-            'amount_in_token': float(row['amount_in_token']) if row['amount_in_token'] else 0.0,
-            'price_in_sol': float(row['price_in_sol']) if row['price_in_sol'] else 0.0,
+    Returns:
+        tuple: (published, errors, undelivered) trade counts; undelivered
+            trades were rejected by the broker or never acknowledged, and
+            are also included in errors
+        
+    Raises:
+        Exception: If a send fails; the rest of the file is not sent
+    """
+    message_count = 0
+    error_count = 0
+    
+    # Delivery reports are served from poll()/flush(), so they are
+    # tracked separately from the messages queued by this loop
+    delivered = [0]
+    send_errors = []
+    
+    def delivery_report(trade_count, err, msg):
+        if err is None:
+            delivered[0] += trade_count
+        else:
+            send_errors.append((trade_count, err))
+    
+    # Bound once so the per-message path skips repeated attribute lookups
+    produce = producer.produce
+    poll = producer.poll
+    single_trade_report = partial(delivery_report, 1)
+    
+    def publish(token_address, value, trade_count):
+        # Publish without waiting for the broker, so linger.ms/batch.size
+        # can group messages into batches
+        # Use token_address as the key for partitioning (keeps same token data together)
+        key = encode_key(token_address)
+        payload = orjson.dumps(value)
+        if trade_count > 1 and len(payload) > MAX_MESSAGE_BYTES:
+            # Too large for one message: send each half as its own array,
+            # keeping the trades in order
+            middle = trade_count // 2
+            publish(token_address, value[:middle], middle)
+            publish(token_address, value[middle:], trade_count - middle)
+            return
+        callback = single_trade_report if trade_count == 1 else partial(delivery_report, trade_count)
+        deadline = None
+        while True:
+            try:
+                produce(TOPIC_NAME, key=key, value=payload, callback=callback)
+                break
+            except BufferError:
+                # Local queue is full: serve deliveries until there is room,
+                # blocking for at most PRODUCE_BLOCK_SECONDS in total
+                if deadline is None:
+                    deadline = time.monotonic() + PRODUCE_BLOCK_SECONDS
+                elif time.monotonic() >= deadline:
+                    raise
+                poll(0.1)
+        
+        # Serve delivery callbacks for completed sends
+        poll(0)
+    
+    # Trades waiting to be sent as one message, grouped by token so
+    # each batch keeps a single partition key and per-token order
+    pending_batches = {}
+    
+    row_num = 0
+    
+    # Pacing deadline for real-time simulation; sleeping until a fixed
+    # schedule (rather than a flat sleep per message) absorbs send time
+    next_send_at = time.monotonic()
+    
+    def abort_send(e):
+        # Deliver what was already queued, then stop: the rest of the file
+        # is left unsent, so the run must not be reported as complete
+        logger.error(f"❌ Failed to send message {row_num}: {e}")
+        logger.error(f"❌ Aborting at row {row_num}: the remaining rows were not sent")
+        producer.flush(timeout=60)
+    
+    for trade_messages in trade_blocks:
+        # Stamp messages as they are sent rather than parsed, since the parse
+        # thread runs ahead; the clock is read once per block, or once per
+        # row when pacing stretches a block over minutes
+        processed_timestamp = datetime.utcnow().isoformat()
+        
+        for trade_message in trade_messages:
+            row_num += 1
             
-            # Price change data
-            'change_in_sol': float(row['change_in_sol']) if row['change_in_sol'] else 0.0,
-            'change_in_tokens': float(row['change_in_tokens']) if row['change_in_tokens'] else 0.0,
+            if trade_message is None:
+                error_count += 1
+                continue
             
-            # Reserve data for context
-            'virtual_sol_reserves': float(row['virtual_sol_reserves']) if row['virtual_sol_reserves'] else 0.0,
-            'virtual_token_reserves': float(row['virtual_token_reserves']) if row['virtual_token_reserves'] else 0.0,
-            'real_sol_reserves': float(row['real_sol_reserves']) if row['real_sol_reserves'] else 0.0,
-            'real_token_reserves': float(row['real_token_reserves']) if row['real_token_reserves'] else 0.0,
+            if simulate_realtime:
+                processed_timestamp = datetime.utcnow().isoformat()
+            trade_message.processed_timestamp = processed_timestamp
             
-            # Fee information
-            'fee_recipient': row['fee_recipient'],
-            'fee_basis_points': int(row['fee_basis_points']) if row['fee_basis_points'] else 0,
-            'fee_amount': float(row['fee_amount']) if row['fee_amount'] else 0.0,
+            # Publish message to Redpanda
+            token_address = trade_message.token_address
+            try:
+                if batch_size == 1:
+                    publish(token_address, trade_message, 1)
+                else:
+                    batch = pending_batches.setdefault(token_address, [])
+                    batch.append(trade_message)
+                    if len(batch) >= batch_size:
+                        publish(token_address, batch, len(batch))
+                        del pending_batches[token_address]
+            except Exception as e:
+                abort_send(e)
+                raise
             
-            # Creator info
-            'creator_address': row['creator_address'],
-            'creator_fee_basis_points': int(row['creator_fee_basis_points']) if row['creator_fee_basis_points'] else 0,
-            'creator_fee_amount': float(row['creator_fee_amount']) if row['creator_fee_amount'] else 0.0,
+            message_count += 1
             
-            # Metadata
-            'ingested_at': row['ingested_at'],
-            'processed_timestamp': datetime.utcnow().isoformat()
-        }
-        
-        return trade_message
+            # Log progress every 1024 messages
+            if message_count & PROGRESS_MASK == 0:
+                logger.info(f"✓ Queued {message_count} messages... "
+                            f"(Latest: {token_address[:8]}... "
+                            f"Price: {trade_message.price_in_sol:.8f} SOL)")
+            
+            # Simulate real-time streaming with small delay
+            if simulate_realtime:
+                next_send_at += 0.1  # 100ms between messages
+                time.sleep(max(0.0, next_send_at - time.monotonic()))
+    
+    # Send partially filled batches left at end of file
+    try:
+        for token_address, batch in pending_batches.items():
+            publish(token_address, batch, len(batch))
+    except Exception as e:
+        abort_send(e)
+        raise
+    
+    # Ensure all messages are sent before reporting
+    undelivered = producer.flush(timeout=60)
+    
+    for trade_count, exc in send_errors[:5]:
+        logger.error(f"❌ Delivery failed: {exc}")
+    failed_trades = sum(trade_count for trade_count, _ in send_errors)
+    
+    # Messages still queued at the timeout were never acknowledged; with
+    # batching each holds several trades, so count them by trade
+    unacknowledged = 0
+    if undelivered:
+        unacknowledged = message_count - delivered[0] - failed_trades
+        logger.warning(f"⚠️  {undelivered} messages ({unacknowledged} trades) "
+                       f"still queued after flush timeout")
+    
+    error_count += failed_trades + unacknowledged
+    return delivered[0], error_count, failed_trades + unacknowledged
+
+def read_csv_header(file, csv_file):
+    """
+    Read the header line and build the matching row decoder
+    
+    Exits the script if the file is empty or missing required columns.
+    
+    Args:
+        file: Open CSV file positioned at the start
+        csv_file (str): Path to CSV file, for error messages
         
-    except (ValueError, KeyError) as e:
-        print(f"⚠️  Error parsing row: {e}")
-        return None
+    Returns:
+        tuple: (header, decode_row) with header names stripped of whitespace
+    """
+    # An empty file reads as '', which csv.reader turns into an empty row
+    header = next(csv.reader([file.readline()]), None)
+    if not header:
+        logger.error(f"❌ CSV file is empty: {csv_file}")
+        sys.exit(1)
+    
+    # Strip whitespace from headers (common CSV issue)
+    header = [name.strip() for name in header]
+    try:
+        return header, make_row_decoder(header)
+    except ValueError as e:
+        logger.error(f"❌ {e}")
+        sys.exit(1)
+
+def log_ingestion_summary(published, errors, undelivered=0):
+    """
+    Log the final published/error trade counts
+    
+    Rows that failed to parse are only counted, but trades the broker did
+    not acknowledge mean the topic is incomplete, so the script then exits 1.
+    
+    Args:
+        published (int): Trades acknowledged by the broker
+        errors (int): Trades that failed to parse or deliver
+        undelivered (int): Trades rejected by or never acknowledged by the broker
+    """
+    logger.info(f"\n{'='*60}")
+    if undelivered:
+        logger.info(f"📉 Ingestion Failed: {undelivered} trades were not delivered")
+    else:
+        logger.info(f"📈 Ingestion Complete!")
+    logger.info(f"✅ Successfully published: {published} trades")
+    logger.info(f"❌ Errors: {errors} trades")
+    logger.info(f"{'='*60}\n")
+    
+    if undelivered:
+        sys.exit(1)
 
-def ingest_csv_to_redpanda(csv_file, producer, simulate_realtime=True):
+def ingest_csv_to_redpanda(csv_file, producer, simulate_realtime=False, batch_size=1):
     """
     Read CSV file and publish each row to Redpanda
     
     Args:
         csv_file (str): Path to CSV file
-        producer (KafkaProducer): Kafka producer instance
-        simulate_realtime (bool): If True, adds delay between messages
+        producer (Producer): Kafka producer instance
+        simulate_realtime (bool): If True, paces messages 100ms apart
+        batch_size (int): Trades per message; above 1, each message value is
+            a JSON array of trades for a single token
     """
     try:
-        with open(csv_file, 'r', encoding='utf-8') as file:
-            # Use DictReader to automatically parse headers
-            reader = csv.DictReader(file)
+        with open(csv_file, 'r', encoding='utf-8',
+                  buffering=READ_BUFFER_BYTES, newline='') as file:
+            _, decode_row = read_csv_header(file, csv_file)
+            reader = csv.reader(file)
             
-            # Strip whitespace from headers (common CSV issue)
-            reader.fieldnames = [name.strip() for name in reader.fieldnames]
+            logger.info(f"\n📊 Starting data ingestion from {csv_file}")
+            logger.info(f"📤 Publishing to topic: {TOPIC_NAME}\n")
             
-            message_count = 0
-            error_count = 0
+            # Parse on a separate thread so decoding overlaps with sending; the
+            # bounded queue stops the parser from running far ahead
+            block_queue = queue.Queue(maxsize=PARSE_QUEUE_BLOCKS)
+            threading.Thread(
+                target=parse_worker,
+                args=(reader, decode_row, block_queue),
+                daemon=True
+            ).start()
             
-            print(f"\n📊 Starting data ingestion from {csv_file}")
-            print(f"📤 Publishing to topic: {TOPIC_NAME}\n")
-            
-            for row_num, row in enumerate(reader, start=1):
-                # Parse CSV row to JSON
-                trade_message = parse_csv_row(row)
-                
-                if trade_message is None:
-                    error_count += 1
-                    continue
-                
-                try:
-                    # Publish message to Redpanda
-                    # Use token_address as the key for partitioning (keeps same token data together)
-                    future = producer.send(
-                        TOPIC_NAME,
-                        key=trade_message['token_address'].encode('utf-8'),
-                        value=trade_message
-                    )
-                    
-                    # Wait for message to be sent (blocking call)
-                    record_metadata = future.get(timeout=10)
-                    
-                    message_count += 1
-                    
-                    # Print progress every 50 messages
-                    if message_count % 50 == 0:
-                        print(f"✓ Sent {message_count} messages... "
-                              f"(Latest: {trade_message['token_address'][:8]}... "
-                              f"Price: {trade_message['price_in_sol']:.8f} SOL)")
-                    
-                    # Simulate real-time streaming with small delay
-                    if simulate_realtime:
-                        time.sleep(0.1)  # 100ms delay between messages
-                    
-                except Exception as e:
-                    print(f"❌ Failed to send message {row_num}: {e}")
-                    error_count += 1
-            
-            # Ensure all messages are sent before closing
-            producer.flush()
-            
-            print(f"\n{'='*60}")
-            print(f"📈 Ingestion Complete!")
-            print(f"✅ Successfully published: {message_count} messages")
-            print(f"❌ Errors: {error_count} messages")
-            print(f"{'='*60}\n")
+            published, errors, undelivered = publish_trade_blocks(
+                producer,
+                iter_queued_blocks(block_queue),
+                simulate_realtime=simulate_realtime,
+                batch_size=batch_size
+            )
+            log_ingestion_summary(published, errors, undelivered)
             
     except FileNotFoundError:
-        print(f"❌ CSV file not found: {csv_file}")
-        print(f"💡 Make sure {csv_file} is in the same directory as this script")
+        logger.error(f"❌ CSV file not found: {csv_file}")
+        logger.info(f"💡 Make sure {csv_file} is in the same directory as this script")
+        sys.exit(1)
+        
+    except (UnicodeDecodeError, csv.Error) as e:
+        # Rows after the unreadable part were never decoded, so stop here
+        # rather than reporting a complete run
+        logger.error(f"❌ Failed to read {csv_file}: {e}")
         sys.exit(1)
         
     except Exception as e:
-        print(f"❌ Unexpected error during ingestion: {e}")
+        logger.error(f"❌ Unexpected error during ingestion: {e}")
         sys.exit(1)
 
+def split_byte_ranges(mm, start, parts):
+    """
+    Split the data section of a mapped CSV into line-aligned byte ranges
+    
+    Args:
+        mm (mmap.mmap): Memory-mapped CSV file
+        start (int): Offset of the first data row (just past the header)
+        parts (int): Number of ranges to produce
+        
+    Returns:
+        list: (start, end) byte offsets; empty ranges are dropped
+    """
+    size = len(mm)
+    boundaries = [start]
+    for part in range(1, parts):
+        # Move each cut forward to the start of the next line
+        cut = max(start + (size - start) * part // parts, boundaries[-1])
+        newline = mm.find(b'\n', cut)
+        boundaries.append(size if newline == -1 else newline + 1)
+    boundaries.append(size)
+    
+    return [(begin, end) for begin, end in zip(boundaries, boundaries[1:]) if end > begin]
+
+def init_worker_logging():
+    """Log directly to stdout in worker processes"""
+    logger.handlers.clear()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+def iter_range_lines(mm, start, end):
+    """
+    Yield the decoded lines of one byte range of a mapped CSV
+    
+    Args:
+        mm (mmap.mmap): Memory-mapped CSV file
+        start (int): Offset of the first line of the range
+        end (int): Offset just past the last line of the range
+        
+    Yields:
+        str: Lines with their line endings, ready for csv.reader
+    """
+    mm.seek(start)
+    while mm.tell() < end:
+        yield mm.readline().decode('utf-8')
+
+def ingest_byte_range(csv_file, header, start, end, batch_size):
+    """
+    Decode and publish the CSV rows within one byte range (worker process)
+    
+    Args:
+        csv_file (str): Path to CSV file
+        header (list): Stripped column names from the first line
+        start (int): Offset of the first byte of the range
+        end (int): Offset just past the last byte of the range
+        batch_size (int): Trades per message
+        
+    Returns:
+        tuple: (published, errors, undelivered) trade counts
+    """
+    # Each process needs its own producer; connection errors surface as
+    # delivery failures rather than exiting the worker
+    producer = Producer(producer_config())
+    
+    with open(csv_file, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Stream lines out of the mapping rather than copying the slice,
+            # so each worker only holds the block being decoded
+            reader = csv.reader(iter_range_lines(mm, start, end))
+            trade_blocks = read_trade_batches(
+                reader, make_row_decoder(header), slice_start=start
+            )
+            return publish_trade_blocks(producer, trade_blocks, batch_size=batch_size)
+
+def ingest_csv_parallel(csv_file, workers, batch_size=1):
+    """
+    Publish a CSV to Redpanda from several processes, one byte range each
+    
+    Rows are split at line boundaries with no regard to token, so trades of
+    a token that straddles a boundary are sent by two producers and may
+    arrive out of order.
+    
+    The file is cut on raw newlines, so quoted fields that contain line
+    breaks are not supported here; such a field can be split between two
+    workers. Use the single-process path for those files.
+    
+    Args:
+        csv_file (str): Path to CSV file
+        workers (int): Number of worker processes
+        batch_size (int): Trades per message
+    """
+    try:
+        with open(csv_file, 'r', encoding='utf-8', newline='') as file:
+            header, _ = read_csv_header(file, csv_file)
+        
+        with open(csv_file, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                header_end = mm.find(b'\n')
+                data_start = len(mm) if header_end == -1 else header_end + 1
+                ranges = split_byte_ranges(mm, data_start, workers)
+        
+        if not ranges:
+            # Header only: nothing to hand out to workers
+            logger.info(f"\n📊 No trades to ingest in {csv_file}")
+            log_ingestion_summary(0, 0)
+            return
+        
+        logger.info(f"\n📊 Starting data ingestion from {csv_file} with {len(ranges)} workers")
+        logger.info(f"📤 Publishing to topic: {TOPIC_NAME}\n")
+        
+        # Spawn rather than fork: the parent runs a logging thread, and
+        # librdkafka clients must not be inherited across fork()
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(len(ranges), initializer=init_worker_logging) as pool:
+            results = pool.starmap(
+                ingest_byte_range,
+                [(csv_file, header, start, end, batch_size) for start, end in ranges]
+            )
+        
+        published, errors, undelivered = (sum(counts) for counts in zip(*results))
+        log_ingestion_summary(published, errors, undelivered)
+        
+    except FileNotFoundError:
+        logger.error(f"❌ CSV file not found: {csv_file}")
+        logger.info(f"💡 Make sure {csv_file} is in the same directory as this script")
+        sys.exit(1)
+        
+    except (UnicodeDecodeError, csv.Error) as e:
+        # Rows after the unreadable part were never decoded, so stop here
+        # rather than reporting a complete run
+        logger.error(f"❌ Failed to read {csv_file}: {e}")
+        sys.exit(1)
+        
+    except Exception as e:
+        logger.error(f"❌ Unexpected error during ingestion: {e}")
+        sys.exit(1)
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Publish Pump.fun trades from CSV to Redpanda"
+    )
+    parser.add_argument(
+        '--simulate-realtime',
+        action='store_true',
+        help="Pace messages 100ms apart to mimic a live trade stream"
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=1,
+        help=f"Trades per message, sent as a JSON array when above 1 "
+             f"(e.g. {BATCH_SIZE}; default: 1, one trade per message). "
+             f"Arrays over {MAX_MESSAGE_BYTES} bytes are split in two"
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help=f"Producer processes, each sending one slice of the file "
+             f"(e.g. {os.cpu_count()}; default: 1). Per-token order is only "
+             f"kept within a slice, and quoted fields must not contain newlines"
+    )
+    return parser.parse_args()
+
 def main():
     """Main execution function"""
+    args = parse_args()
+    if args.batch_size < 1:
+        print("❌ --batch-size must be at least 1")
+        sys.exit(1)
+    if args.workers < 1:
+        print("❌ --workers must be at least 1")
+        sys.exit(1)
+    if args.workers > 1 and args.simulate_realtime:
+        print("❌ --simulate-realtime cannot be combined with --workers")
+        sys.exit(1)
+    
     print("="*60)
     print("🚀 Pump.fun Trading Data Ingestion Script")
     print("="*60)
     
-    # Create producer connection
+    # Create producer connection; in --workers mode each worker opens its
+    # own, so this one only checks that the broker is reachable
     producer = create_producer()
+    if args.workers > 1:
+        producer = None
+    
+    log_listener = setup_logging()
     
     try:
         # Ingest CSV data
-        ingest_csv_to_redpanda(CSV_FILE, producer, simulate_realtime=True)
+        if args.workers > 1:
+            ingest_csv_parallel(CSV_FILE, args.workers, batch_size=args.batch_size)
+        else:
+            ingest_csv_to_redpanda(
+                CSV_FILE,
+                producer,
+                simulate_realtime=args.simulate_realtime,
+                batch_size=args.batch_size
+            )
         
     except KeyboardInterrupt:
         print("\n⚠️  Interrupted by user. Shutting down gracefully...")
         
     finally:
-        # Always close producer connection
-        producer.close()
-        print("👋 Producer closed. Goodbye!")
+        # Always deliver anything still queued before exiting
+        if producer is not None:
+            producer.flush(timeout=10)
+        log_listener.stop()
+        print("👋 Producer flushed. Goodbye!")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
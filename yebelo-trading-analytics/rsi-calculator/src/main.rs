@@ -22,6 +22,24 @@ struct TradeMessage {
     processed_timestamp: String,
 }
 
+/// Payload on the trade-data topic: one trade, or a batch of trades
+/// for a single token when the ingestion script runs with --batch-size
+#[derive(Debug, Deserialize)]
+#[serde(untagged)]
+enum TradePayload {
+    Single(TradeMessage),
+    Batch(Vec<TradeMessage>),
+}
+
+impl TradePayload {
+    fn into_trades(self) -> Vec<TradeMessage> {
+        match self {
+            TradePayload::Single(trade) => vec![trade],
+            TradePayload::Batch(trades) => trades,
+        }
+    }
+}
+
 /// RSI calculation result to be published
 #[derive(Debug, Serialize)]
 struct RsiMessage {
@@ -209,6 +227,7 @@ async fn main() -> Result<()> {
     info!("🔄 Listening for messages on 'trade-data' topic...\n");
     
     let mut message_count = 0u64;
+    let mut trade_count = 0u64;
     let mut rsi_published_count = 0u64;
     
     // Main message processing loop
@@ -220,46 +239,50 @@ async fn main() -> Result<()> {
                 // Extract message payload
                 if let Some(payload) = message.payload() {
                     // Deserialize JSON message
-                    match serde_json::from_slice::<TradeMessage>(payload) {
-                        Ok(trade) => {
-                            // Process trade and calculate RSI
-                            if let Some(rsi_msg) = calculator.process_trade(trade) {
-                                let token_short = &rsi_msg.token_address[..8];
-                                
-                                // Log RSI value
-                                info!(
-                                    "📈 Token: {}... | Price: {:.8} SOL | RSI: {:.2} | Signal: {}",
-                                    token_short,
-                                    rsi_msg.current_price,
-                                    rsi_msg.rsi_value,
-                                    rsi_msg.signal
-                                );
-                                
-                                // Serialize RSI message to JSON
-                                let rsi_json = serde_json::to_string(&rsi_msg)
-                                    .context("Failed to serialize RSI message")?;
+                    match serde_json::from_slice::<TradePayload>(payload) {
+                        Ok(trades) => {
+                            for trade in trades.into_trades() {
+                                trade_count += 1;
                                 
-                                // Publish to rsi-data topic
-                                let record = FutureRecord::to("rsi-data")
-                                    .key(&rsi_msg.token_address)
-                                    .payload(&rsi_json);
-                                
-                                // Send message (non-blocking)
-                                match producer.send(record, Duration::from_secs(0)).await {
-                                    Ok(_) => {
-                                        rsi_published_count += 1;
-                                        
-                                        // Print statistics every 50 messages
-                                        if rsi_published_count % 50 == 0 {
-                                            info!(
-                                                "📊 Stats: Processed {} trades | Published {} RSI values",
-                                                message_count,
-                                                rsi_published_count
-                                            );
+                                // Process trade and calculate RSI
+                                if let Some(rsi_msg) = calculator.process_trade(trade) {
+                                    let token_short = &rsi_msg.token_address[..8];
+                                    
+                                    // Log RSI value
+                                    info!(
+                                        "📈 Token: {}... | Price: {:.8} SOL | RSI: {:.2} | Signal: {}",
+                                        token_short,
+                                        rsi_msg.current_price,
+                                        rsi_msg.rsi_value,
+                                        rsi_msg.signal
+                                    );
+                                    
+                                    // Serialize RSI message to JSON
+                                    let rsi_json = serde_json::to_string(&rsi_msg)
+                                        .context("Failed to serialize RSI message")?;
+                                    
+                                    // Publish to rsi-data topic
+                                    let record = FutureRecord::to("rsi-data")
+                                        .key(&rsi_msg.token_address)
+                                        .payload(&rsi_json);
+                                    
+                                    // Send message (non-blocking)
+                                    match producer.send(record, Duration::from_secs(0)).await {
+                                        Ok(_) => {
+                                            rsi_published_count += 1;
+                                            
+                                            // Print statistics every 50 messages
+                                            if rsi_published_count % 50 == 0 {
+                                                info!(
+                                                    "📊 Stats: Processed {} trades | Published {} RSI values",
+                                                    trade_count,
+                                                    rsi_published_count
+                                                );
+                                            }
+                                        }
+                                        Err((e, _)) => {
+                                            error!("❌ Failed to publish RSI: {}", e);
                                         }
-                                    }
-                                    Err((e, _)) => {
-                                        error!("❌ Failed to publish RSI: {}", e);
                                     }
                                 }
                             }
@@ -31,9 +31,13 @@ export async function GET() {
         if (!message.value) return;
 
         try {
-          const trade = JSON.parse(message.value.toString());
-          if (trade.token_address) {
-            tokens.add(trade.token_address);
+          // Messages hold one trade, or an array of trades when batched
+          const payload = JSON.parse(message.value.toString());
+          const trades = Array.isArray(payload) ? payload : [payload];
+          for (const trade of trades) {
+            if (trade.token_address) {
+              tokens.add(trade.token_address);
+            }
           }
 
           messageCount++;